@@ -0,0 +1,8 @@
+# Shared by the addon and the import script. Kept apart from main.py, as
+# importing that sets up the addon and opens its files.
+
+GUESSES_FILE = "guesses.arrow"
+# Written by read_excel_into_parquet.py. Replaces the guesses in GUESSES_FILE
+# on the next start of the addon, and is then renamed with an .imported suffix
+IMPORTED_GUESSES_FILE = "guesses.parquet"
+MAX_SCORE = 30000
@@ -1,25 +1,47 @@
-import json
+import atexit
+import math
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from pprint import pformat
 
-import pandas as pd
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 from geopy.distance import GeodesicDistance
 from mitmproxy.http import HTTPFlow, Request, Response
 
+from constants import GUESSES_FILE, IMPORTED_GUESSES_FILE, MAX_SCORE
 from trilateration import trilaterate, distance_to_score
 
 
 EVENTS_FILE = "whats_going_on.txt"
-GUESSES_FILE = "guesses.parquet"
 BACKUPS_DIR = "backups"
+JSON_CONTENT_TYPE = "application/json"
+# The game API's bodies are tiny, anything bigger is not worth parsing
+MAX_JSON_BYTES = 1 << 16
+GUESSES_SCHEMA = pa.schema(
+    [
+        ("pic", pa.string()),
+        ("lat", pa.float64()),
+        ("lon", pa.float64()),
+        ("score", pa.float64()),
+    ]
+)
+# Start of the Arrow IPC file format, which guesses were kept in before
+ARROW_FILE_MAGIC = b"ARROW1"
 
 Path(BACKUPS_DIR).mkdir(exist_ok=True)
 
+# Run with `mitmdump -s main.py --allow-hosts api.otaguessr.fi` so that other
+# traffic is passed through untouched and never reaches the addon hooks.
+
 # TODO:
 #  * If trilateration doesn't produce a perfect score, the data could be poisoned by a manual data entry mistake. Delete existing data points. Alternatively, develop trilateration further by picking the highest performing three points.
 #  * Create guess class so that guess elements are not accessed by index
-#  * Store score range in a constant to reduce magic numbers
 #  * Capture each picture
 #  * See if there are duplicate locations on different pics
 
@@ -28,119 +50,311 @@ def valid_guess_row(row: tuple | list) -> bool:
     """Validate to be
     string id, latitude, longitude, numeric score
     """
-    length = 4
-    if (
-        isinstance(row, (tuple, list))
-        and len(row) == length
-        and isinstance(row[0], str)
-        and row[0] != "None"
-        and isinstance(row[1], float)
-        and -90 <= row[1] <= 90
-        and isinstance(row[2], float)
-        and -180 <= row[2] <= 180
-        and isinstance(row[3], (float, int))
-        and 0 <= row[3] <= 30000
-    ):
-        return True
-    else:
+    if not isinstance(row, (tuple, list)):
+        return False
+    try:
+        pic, lat, lon, score = row
+    except ValueError:
         return False
+    return (
+        type(pic) is str
+        and pic != "None"
+        and type(lat) is float
+        and -90 <= lat <= 90
+        and type(lon) is float
+        and -180 <= lon <= 180
+        and type(score) in (float, int)
+        and 0 <= score <= MAX_SCORE
+    )
 
 
 class EventsOut:
+    buffer_size = 1 << 16
+
     def __init__(self, filepath: str | Path) -> None:
         self.filepath = filepath
+        self._fh = open(self.filepath, "a", buffering=self.buffer_size)
+        # Lines collected until the next flush, written in one go
+        self._lines: list[str] = []
+        atexit.register(self.close)
 
     def clear(self) -> None:
-        with open(self.filepath, "w"):
-            pass
+        self._lines = []
+        self._fh.close()
+        self._fh = open(self.filepath, "w", buffering=self.buffer_size)
 
     def write(self, line: str) -> None:
-        with open(self.filepath, "a") as f:
-            print(line, file=f)
+        self._lines.append(line)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        self._lines.extend(lines)
+
+    def flush(self) -> None:
+        if self._lines:
+            self._fh.write("\n".join(self._lines) + "\n")
+            self._lines = []
+        self._fh.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._fh.close()
+
+
+def read_stream_batches(source: pa.NativeFile) -> list[pa.RecordBatch]:
+    """Record batches of an Arrow IPC stream up to the last whole one,
+    so that a stream cut short by a crash can still be read.
+    Also takes the IPC file format, read as the stream inside it
+    in case the footer was never written.
+    """
+    if source.read(len(ARROW_FILE_MAGIC)) == ARROW_FILE_MAGIC:
+        # Magic is padded to 8 bytes, followed by the stream
+        source.seek(8)
+    else:
+        source.seek(0)
+    batches = []
+    try:
+        for batch in pa.ipc.open_stream(source):
+            batches.append(batch)
+    except (pa.ArrowInvalid, OSError):
+        # Truncated, keep the batches read so far
+        pass
+    return batches
+
+
+def read_guesses(path: Path) -> list[tuple]:
+    """Read guesses from an Arrow IPC stream, or from parquet by suffix"""
+    with pa.memory_map(str(path)) as source:
+        if path.suffix == ".parquet":
+            table = pq.read_table(source, columns=GUESSES_SCHEMA.names)
+        else:
+            batches = read_stream_batches(source)
+            table = pa.Table.from_batches(batches, schema=GUESSES_SCHEMA)
+        table = table.select(GUESSES_SCHEMA.names).cast(GUESSES_SCHEMA)
+        columns = [column.to_pylist() for column in table.columns]
+    return list(zip(*columns))
+
+
+def guesses_to_batch(rows: list[tuple]) -> pa.RecordBatch:
+    columns = list(zip(*rows)) or [() for _ in GUESSES_SCHEMA]
+    arrays = [
+        pa.array(column, type=field.type)
+        for column, field in zip(columns, GUESSES_SCHEMA)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=GUESSES_SCHEMA)
 
 
 class Guesses:
-    backup_time_format = "%Y-%m-%dT%H-%M-%S-%Z"
+    # Only used to read the timestamps of backups named before epoch seconds
+    legacy_backup_time_format = "%Y-%m-%dT%H-%M-%S-%Z"
 
     def __init__(
         self,
         filepath: str | Path,
         backups_dir: str | Path,
+        import_filepath: str | Path | None = None,
+        events_out: EventsOut | None = None,
     ) -> None:
         self.filepath = Path(filepath)
+        # Where failed backups are reported
+        self.events_out = events_out
         self.backups_dir = Path(backups_dir)
-        self.backup_interval = timedelta(minutes=10)
-        self.df = pd.read_parquet(filepath)
+        self._backups_dir_str = str(self.backups_dir)
+        self._backup_stem_prefix = self.filepath.stem
+        self.backup_interval = timedelta(minutes=10).total_seconds()
+        self.save_every = 10
+        # Append-only store of all guesses, indexed by picture id
+        self._rows: list[tuple] = []
+        self._by_pic: dict[str, list[tuple]] = {}
+        # Location of the first perfect guess for each picture that has one
+        self._perfect: dict[str, tuple[float, float]] = {}
+        # Guesses are appended as record batches to a copy of the guesses file,
+        # which replaces the original when closed. The copy is an Arrow IPC
+        # stream, readable up to its last whole batch if the session dies
+        # before that, and then recovered on the next start.
+        self._writing_path = self.filepath.with_name(self.filepath.name + ".partial")
+        # Guesses written by the import script replace the stored ones, as the
+        # spreadsheet they come from is where mistakes get corrected
+        self.import_filepath = import_filepath and Path(import_filepath)
+        imported = bool(self.import_filepath and self.import_filepath.exists())
+        if imported:
+            rows = read_guesses(self.import_filepath)
+        else:
+            rows = read_guesses(self.filepath) if self.filepath.exists() else []
+            if self._writing_path.exists():
+                # The copy starts with all guesses of the file it was made from
+                unclosed_rows = read_guesses(self._writing_path)
+                if len(unclosed_rows) >= len(rows):
+                    rows = unclosed_rows
+        for row in rows:
+            self._store_guess(row)
+        # Number of guesses added since the last save
+        self._unsaved = 0
+        # Location estimates by picture id, dropped when the picture gets a new guess
+        self._estimate_cache: dict[str, tuple[float, float] | None] = {}
+        # Backups are scheduled on the monotonic clock, so that wall clock
+        # adjustments can't delay or rush them
+        self._next_backup_due = time.monotonic()
+        latest_backup_time = self.find_latest_backup_time()
+        if latest_backup_time is not None:
+            since_latest = max(time.time() - latest_backup_time, 0)
+            self._next_backup_due += max(self.backup_interval - since_latest, 0)
+        # Backups are written on a worker thread so the proxy isn't held up
+        self._backup_executor: ThreadPoolExecutor | None = ThreadPoolExecutor(
+            max_workers=1
+        )
+        self._backup_future: Future | None = None
+        self._sink = pa.OSFile(str(self._writing_path), "wb")
+        self._writer: pa.ipc.RecordBatchStreamWriter | None = pa.ipc.new_stream(
+            self._sink, GUESSES_SCHEMA
+        )
+        self._writer.write_batch(guesses_to_batch(self._rows))
+        self._sink.flush()
+        if imported:
+            # Imported guesses are in the copy now, don't import them again
+            imported_path = self.import_filepath.with_name(
+                self.import_filepath.name + ".imported"
+            )
+            os.replace(self.import_filepath, imported_path)
+        atexit.register(self.close)
+
+    def _store_guess(self, guess: tuple) -> None:
+        self._rows.append(guess)
+        self._by_pic.setdefault(guess[0], []).append(guess)
+        if guess[3] == MAX_SCORE and guess[0] not in self._perfect:
+            self._perfect[guess[0]] = (guess[1], guess[2])
+
+    def save_to_file(self, path: str | Path, rows: list[tuple] | None = None):
+        if rows is None:
+            rows = self._rows
+        table = pa.Table.from_batches([guesses_to_batch(rows)])
+        pq.write_table(
+            table,
+            path,
+            compression="zstd",
+            compression_level=1,
+            use_dictionary=["pic"],
+        )
+
+    def flush(self) -> None:
+        """Append pending guesses to file, backing up if it's time."""
+        if not self._unsaved or self._writer is None:
+            return
+        new_rows = self._rows[-self._unsaved :]
+        self._writer.write_batch(guesses_to_batch(new_rows))
+        self._sink.flush()
+        self._unsaved = 0
+        if self.time_to_create_backup():
+            self.create_backup()
 
-    def save_to_file(self, path: Path | None = None):
-        if path is None:
-            path = self.filepath
-        self.df.to_parquet(path)
+    def close(self) -> None:
+        """Finish the guesses file and move it in place of the original."""
+        if self._writer is None:
+            return
+        # Stop the backup worker first, as at interpreter exit it can no
+        # longer take jobs; a backup due in the final flush is then written here
+        if self._backup_executor is not None:
+            self._backup_executor.shutdown(wait=True)
+            self._backup_executor = None
+        self.flush()
+        self.check_backup()
+        self._writer.close()
+        self._writer = None
+        self._sink.close()
+        os.replace(self._writing_path, self.filepath)
 
     def backup_filestem_suffix(self):
-        now_utc_aware = datetime.utcnow().replace(tzinfo=timezone.utc)
-        time_string = now_utc_aware.strftime(self.backup_time_format)
-        return f"_backup_{time_string}"
+        return f"_backup_{int(time.time())}"
 
-    def backup_filestem_time_parse(self, stem: str):
-        time_string = stem.split("_")[-1]
-        return datetime.strptime(time_string, self.backup_time_format)
+    def backup_filestem_time_parse(self, stem: str) -> float:
+        """Backup creation time as seconds since the epoch"""
+        time_string = stem.rsplit("_", 1)[-1]
+        try:
+            return int(time_string)
+        except ValueError:
+            dt = datetime.strptime(time_string, self.legacy_backup_time_format)
+            return dt.replace(tzinfo=timezone.utc).timestamp()
 
-    def time_to_create_backup(self) -> bool:
-        now = datetime.utcnow()
+    def find_latest_backup_time(self) -> float | None:
         times = []
         for path in self.backups_dir.iterdir():
-            dt = self.backup_filestem_time_parse(path.stem)
-            times.append(dt)
-        if times:
-            latest = max(times)
-            return now - latest >= self.backup_interval
-        else:
-            return True
+            t = self.backup_filestem_time_parse(path.stem)
+            times.append(t)
+        return max(times, default=None)
+
+    def time_to_create_backup(self) -> bool:
+        return time.monotonic() >= self._next_backup_due
 
     def create_backup(self) -> None:
-        filestem = self.filepath.stem
-        new_stem = filestem + self.backup_filestem_suffix()
-        backup_filename = self.filepath.with_stem(new_stem).name
-        backup_filepath = self.backups_dir / backup_filename
-        self.save_to_file(path=backup_filepath)
+        # Backups are kept as parquet for long-term storage
+        suffix = self.backup_filestem_suffix()
+        backup_filename = f"{self._backup_stem_prefix}{suffix}.parquet"
+        backup_filepath = os.path.join(self._backups_dir_str, backup_filename)
+        # Scheduled first, so that a failed backup is tried again next time
+        self._next_backup_due = time.monotonic() + self.backup_interval
+        self.check_backup()
+        if self._backup_executor is None:
+            try:
+                self.save_to_file(backup_filepath)
+            except Exception as error:
+                self.report_backup_failure(error)
+        else:
+            # Snapshot, as the worker must not see guesses appended meanwhile
+            rows = self._rows.copy()
+            self._backup_future = self._backup_executor.submit(
+                self.save_to_file, backup_filepath, rows
+            )
+
+    def check_backup(self) -> None:
+        """Report a failure of the backup written on the worker, if any.
+        A failed backup doesn't stop saving guesses or later backups.
+        """
+        if self._backup_future is None:
+            return
+        error = self._backup_future.exception()
+        self._backup_future = None
+        if error is not None:
+            self.report_backup_failure(error)
+
+    def report_backup_failure(self, error: BaseException) -> None:
+        message = f"Backup failed: {error!r}"
+        if self.events_out is None:
+            print(message, file=sys.stderr)
+        else:
+            self.events_out.write(message)
 
     def total_guesses(self):
-        return len(self.df)
+        return len(self._rows)
 
     def get_guesses(self, pic: str) -> list[tuple]:
-        guesses_df = self.df.loc[self.df.iloc[:, 0] == pic]
-        guesses_tuples = list(guesses_df.itertuples(index=False, name=None))
-        return guesses_tuples
+        return self._by_pic.get(pic, [])
 
     def has_perfect_guess(self, pic: str) -> bool:
-        guesses = self.get_guesses(pic)
-        return any(guess[3] == 30000 for guess in guesses)
+        return pic in self._perfect
 
     def add_guess(self, guess: tuple | list) -> None:
         """Add guess, if valid, to the pile."""
         if not valid_guess_row(guess):
             raise ValueError(f"Invalid guess row. Got {guess}")
-        new = pd.DataFrame([guess], columns=self.df.columns)
-        self.df = pd.concat([self.df, new])
-        self.save_to_file()
-        if self.time_to_create_backup():
-            self.create_backup()
+        self._store_guess(tuple(guess))
+        self._estimate_cache.pop(guess[0], None)
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.flush()
 
     def estimate_true_location(self, pic: str) -> tuple[float, float] | None:
         """Return estimate for location (lat, lon)
-        if there are at least three previous guesses,
+        if there are at least three previous guesses that scored,
         otherwise return None.
         """
-        guesses = self.get_guesses(pic)
-        # Check for perfect scores
-        for guess in guesses:
-            score = guess[3]
-            if score == 30000:
-                lat = guess[1]
-                lon = guess[2]
-                return (lat, lon)
-        # No perfect score yet, estimate
+        if pic in self._perfect:
+            return self._perfect[pic]
+        if pic not in self._estimate_cache:
+            self._estimate_cache[pic] = self._compute_estimate(pic)
+        return self._estimate_cache[pic]
+
+    def _compute_estimate(self, pic: str) -> tuple[float, float] | None:
+        # A score of 0 only tells the guess was too far to score at all
+        guesses = [guess for guess in self.get_guesses(pic) if guess[3] > 0]
         if len(guesses) >= 3:
             estimate = trilaterate(guesses)
             return estimate
@@ -149,46 +363,49 @@ class Guesses:
 
 
 def has_json_content_type(event: Request | Response) -> bool:
-    content_type = event.headers.get("Content-Type")
-    return (
-        content_type is not None
-        and isinstance(content_type, str)
-        and content_type.startswith("application/json")
-    )
+    content_type = event.headers.get("Content-Type", "")
+    return content_type.startswith(JSON_CONTENT_TYPE)
+
+
+def read_json(event: Request | Response | None):
+    """Parsed JSON body of a request or response,
+    or if malformed, too large or not present, None.
+    """
+    if event is None:
+        return None
+    content_type = event.headers.get("Content-Type", "")
+    if not content_type.startswith(JSON_CONTENT_TYPE):
+        return None
+    raw_content = event.raw_content
+    if not raw_content or len(raw_content) > MAX_JSON_BYTES:
+        return None
+    try:
+        raw = event.get_content()
+        return orjson.loads(raw) if raw else None
+    except ValueError:
+        # Undecodable content encoding, or malformed JSON
+        return None
 
 
 def try_read_json(flow: HTTPFlow) -> tuple:
     """Returns a pair (request_body, response_body)
-    of parsed JSON, or if malformed or not present, None.
+    of parsed JSON, or if malformed, too large or not present, None.
     Request and response are handled independently.
     """
-    bodies = []
-    for event in (flow.request, flow.response):
-        if event is None or event.text is None or not has_json_content_type(event):
-            bodies.append(None)
-            continue
-        try:
-            request_text = event.text
-        except ValueError:
-            bodies.append(None)
-            continue
-        request_json = json.loads(request_text)
-        bodies.append(request_json)
-    return tuple(bodies)
+    return read_json(flow.request), read_json(flow.response)
 
 
 def replace_request_json(flow: HTTPFlow, body: dict) -> None:
     """Replaces the current request body with the given dict in JSON format."""
     if (
         flow.request is None
-        or flow.request.text is None
+        or flow.request.raw_content is None
         or not has_json_content_type(flow.request)
     ):
-        ValueError(
+        raise ValueError(
             "Not able to write JSON. Request or body not available, or content type not set."
         )
-    request_text = json.dumps(body)
-    flow.request.text = request_text
+    flow.request.content = orjson.dumps(body)
 
 
 class Guessr:
@@ -199,44 +416,54 @@ class Guessr:
     ) -> None:
         self.events_out = events_out
         self.guesses = guesses
-        self.methods = ("GET", "POST")
+        self.methods = frozenset(("GET", "POST"))
         self.host = "api.otaguessr.fi"
         self.play_path = "/api/play"
         self.answer_path = "/api/answer"
-        self.paths = [self.play_path, self.answer_path]
+        self.response_handlers: dict[str, Callable[[HTTPFlow], None]] = {
+            self.play_path: self.handle_play_response,
+            self.answer_path: self.handle_answer_response,
+        }
         self.session_id_cookie_key = "connect.sid"
         # Game state maps session ID (game ID) to current picture (question / challenge)
         self.current_pic: str | None = None
         # Clear output
         self.events_out.clear()
 
+    def is_game_request(self, request: Request) -> bool:
+        # Cheap substring test on the raw host first, so that unrelated
+        # traffic is rejected without parsing the authority for pretty_host.
+        # pretty_host is still the final check, as in transparent mode
+        # request.host is only an IP address.
+        if self.host not in (request.host_header or request.host):
+            return False
+        return request.pretty_host == self.host and request.method in self.methods
+
     def output_next_pic_info(self, pic: str):
         self.events_out.write(f"Next picture id: {pic}")
-        guess_count = len(self.guesses.get_guesses(pic))
-        new_counts = (guess_count, self.guesses.total_guesses())
-        self.events_out.write(f"guess count (pic, total): {new_counts}")
         existing_guesses = self.guesses.get_guesses(pic)
-        guesses_pretty = pformat(existing_guesses)
+        new_counts = (len(existing_guesses), self.guesses.total_guesses())
+        self.events_out.write(f"guess count (pic, total): {new_counts}")
         self.events_out.write("existing guesses:")
-        self.events_out.write(guesses_pretty)
+        # One guess per line, like pformat gives for longer lists
+        self.events_out.writelines(map(repr, existing_guesses))
         location_estimate = self.guesses.estimate_true_location(pic)
         self.events_out.write(f"{location_estimate = }")
 
     def response(self, flow: HTTPFlow) -> None:
-        if (
-            flow.request.pretty_host != self.host
-            or flow.request.method not in self.methods
-        ):
+        if not self.is_game_request(flow.request):
             return
-        self.events_out.write("-------")
-        self.events_out.write(f"Response: {flow.request.pretty_url}")
-        self.events_out.write(f"Method: {flow.request.method}")
-        if flow.request.path == self.play_path:
-            self.handle_play_response(flow)
-        elif flow.request.path == self.answer_path:
-            self.handle_answer_response(flow)
-        else:
-            self.events_out.write("No path match")
+        handler = self.response_handlers.get(flow.request.path)
+        if handler is None:
+            return
+        # Flush even if the handler fails, the lines help debugging it
+        try:
+            self.events_out.write("-------")
+            self.events_out.write(f"Response: {flow.request.pretty_url}")
+            self.events_out.write(f"Method: {flow.request.method}")
+            handler(flow)
+        finally:
+            self.events_out.flush()
 
     def handle_play_response(self, flow: HTTPFlow) -> None:
         _, response_json = try_read_json(flow)
@@ -281,19 +508,24 @@ class Guessr:
     def replace_body_with_estimate(
         self, flow: HTTPFlow, location_estimate: tuple[float, float]
     ):
-        # Replace answer body with good estimate
-        old, _ = try_read_json(flow)
+        # Replace answer body with good estimate. Only the request is parsed,
+        # there is no response yet
+        old = read_json(flow.request)
         new_lat, new_lon = location_estimate
         new_body = {"lat": new_lat, "lon": new_lon}
         replace_request_json(flow, new_body)
+        self.events_out.write("Replaced answer location")
+        new_formatted = f"({new_lat:.6f}, {new_lon:.6f})"
+        if not isinstance(old, dict) or "lat" not in old or "lon" not in old:
+            self.events_out.write(f"was: {old!r}, not a location")
+            self.events_out.write(f"new: {new_formatted}")
+            return
         old_lat, old_lon = old["lat"], old["lon"]
         likely_distance_of_old = GeodesicDistance(
             (old_lat, old_lon), (new_lat, new_lon)
         ).meters
         old_formatted = f"({old_lat:.6f}, {old_lon:.6f})"
-        new_formatted = f"({new_lat:.6f}, {new_lon:.6f})"
         likely_points_of_old = distance_to_score(likely_distance_of_old)
-        self.events_out.write("Replaced answer location")
         self.events_out.write(
             f"was: {old_formatted}, likely with {likely_distance_of_old:.1f} meters distance and a score of {likely_points_of_old:.0f}"
         )
@@ -301,24 +533,38 @@ class Guessr:
             f"new: {new_formatted}, likely with close to 0 meters distance and a score of {distance_to_score(0):.0f}"
         )
 
+    def done(self) -> None:
+        try:
+            self.guesses.close()
+        finally:
+            self.events_out.flush()
+
     def request(self, flow: HTTPFlow) -> None:
+        # Only answers are worth rewriting with an estimate
         if (
-            flow.request.pretty_host != self.host
-            or flow.request.method not in self.methods
+            not self.is_game_request(flow.request)
+            or flow.request.path != self.answer_path
         ):
             return
-        self.events_out.write("-------")
-        self.events_out.write(f"Request: {flow.request.pretty_url}")
-        self.events_out.write(f"Method: {flow.request.method}")
-        if self.current_pic is None:
-            self.events_out.write("No current picture")
-            return
-        self.events_out.write(f"{self.current_pic = }")
-        location_estimate = self.guesses.estimate_true_location(self.current_pic)
-        if location_estimate:
+        try:
+            self.events_out.write("-------")
+            self.events_out.write(f"Request: {flow.request.pretty_url}")
+            self.events_out.write(f"Method: {flow.request.method}")
+            if self.current_pic is None:
+                self.events_out.write("No current picture")
+                return
+            self.events_out.write(f"{self.current_pic = }")
+            location_estimate = self.guesses.estimate_true_location(self.current_pic)
+            if location_estimate is None:
+                return
+            if not all(map(math.isfinite, location_estimate)):
+                self.events_out.write("Estimate is not finite, answer left as is")
+                return
             self.replace_body_with_estimate(flow, location_estimate)
+        finally:
+            self.events_out.flush()
 
 
 events_out = EventsOut(EVENTS_FILE)
-guesses = Guesses(GUESSES_FILE, BACKUPS_DIR)
+guesses = Guesses(GUESSES_FILE, BACKUPS_DIR, IMPORTED_GUESSES_FILE, events_out)
 addons = [Guessr(events_out, guesses)]
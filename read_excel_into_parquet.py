@@ -4,47 +4,49 @@ from pprint import pprint
 import pandas as pd
 import xlwings as xw
 
-from main import valid_guess_row, GUESSES_FILE
+from constants import MAX_SCORE, IMPORTED_GUESSES_FILE
 
 xlsx_filepath = r"C:\Users\jopa0\OneDrive\Spreadsheets\Otaguessr.xlsx"
 summary_sheet = "Distance to score and v.v."
 table_upper_left = "B3"
 column_names = ["pic", "lat", "lon", "score"]
+column_types = {"pic": str, "lat": float, "lon": float, "score": float}
 
 
-def add_guesses_to_df(df: pd.DataFrame, rows: list[list]) -> pd.DataFrame:
-    """Add valid guesses to dataframe, returning the new df"""
-
-    def valid_run(rows: list[list]):
-        firsts = [row[0] for row in rows]
-        return len(set(firsts)) == 1
-
-    valid_runs = []
-    current_run = []
-    for row in rows:
-        if valid_guess_row(row):
-            current_run.append(row)
-        else:
-            if valid_run(current_run):
-                valid_runs.append(current_run)
-            current_run = []
-    if valid_run(current_run):
-        valid_runs.append(current_run)
-
-    # Join lists
-    valid_guesses = []
-    for run in valid_runs:
-        valid_guesses.extend(run)
-    for guess in valid_guesses:
+def valid_guesses_df(rows: list[list]) -> pd.DataFrame:
+    """Valid guesses among the rows of a sheet's table.
+    Only runs of consecutive valid rows sharing a picture id are kept.
+    """
+    if not rows or any(len(row) != len(column_names) for row in rows):
+        return pd.DataFrame(columns=column_names)
+    # Keep the cells as given, so that types can be checked as in valid_guess_row
+    df = pd.DataFrame(rows, columns=column_names, dtype=object)
+    types = df.apply(lambda column: column.map(type))
+    lat = pd.to_numeric(df["lat"], errors="coerce")
+    lon = pd.to_numeric(df["lon"], errors="coerce")
+    score = pd.to_numeric(df["score"], errors="coerce")
+    valid = (
+        types["pic"].eq(str)
+        & df["pic"].ne("None")
+        & types["lat"].eq(float)
+        & lat.between(-90, 90)
+        & types["lon"].eq(float)
+        & lon.between(-180, 180)
+        & types["score"].isin([float, int])
+        & score.between(0, MAX_SCORE)
+    )
+    # Every invalid row starts a new run
+    run_ids = (~valid).cumsum()[valid]
+    valid_df = df[valid]
+    single_pic = valid_df.groupby(run_ids)["pic"].transform("nunique").eq(1)
+    valid_df = valid_df[single_pic]
+    for guess in valid_df.itertuples(index=False, name=None):
         print(f"{guess = }")
-
-    new_guesses_df = pd.DataFrame(valid_guesses)
-    return pd.concat([df, new_guesses_df])
+    return valid_df
 
 
 def get_from_excel() -> pd.DataFrame:
-    df_guesses = pd.DataFrame()
-    print(df_guesses)
+    sheet_dfs = [pd.DataFrame(columns=column_names)]
     with xw.Book(xlsx_filepath) as book:
         sheet: xw.Sheet
         for sheet in book.sheets:
@@ -53,13 +55,13 @@ def get_from_excel() -> pd.DataFrame:
             guesses = sheet[table_upper_left].expand().value
             if any(not isinstance(e, list) for e in guesses):
                 guesses = [guesses]
-            df_guesses = add_guesses_to_df(df_guesses, guesses)
-            df_guesses = df_guesses.drop_duplicates()
+            sheet_dfs.append(valid_guesses_df(guesses))
+    df_guesses = pd.concat(sheet_dfs, ignore_index=True)
+    df_guesses = df_guesses.astype(column_types).drop_duplicates()
     print(f"{len(df_guesses)}")
-    df_guesses.columns = column_names  # type: ignore
     return df_guesses
 
 
 if __name__ == "__main__":
     df = get_from_excel()
-    df.to_parquet(GUESSES_FILE)
+    df.to_parquet(IMPORTED_GUESSES_FILE)
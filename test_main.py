@@ -0,0 +1,225 @@
+import math
+import os
+import shutil
+
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from mitmproxy.test import tflow
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    # Importing main sets up the addon in the working directory
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path_factory.mktemp("addon"))
+        import main
+
+        yield main
+        main.guesses.close()
+
+
+@pytest.fixture
+def guessr(main, tmp_path):
+    events_out = main.EventsOut(tmp_path / "events.txt")
+    guesses = main.Guesses(
+        tmp_path / "guesses.arrow", tmp_path / "backups", events_out=events_out
+    )
+    yield main.Guessr(events_out, guesses)
+    guesses.close()
+
+
+@pytest.fixture(autouse=True)
+def backups_dir(tmp_path):
+    (tmp_path / "backups").mkdir()
+
+
+def answer_flow(lat: float, lon: float):
+    flow = tflow.tflow()
+    flow.request.host = "api.otaguessr.fi"
+    flow.request.headers["Host"] = "api.otaguessr.fi"
+    flow.request.path = "/api/answer"
+    flow.request.method = "POST"
+    flow.request.headers["Content-Type"] = "application/json"
+    flow.request.content = orjson.dumps({"lat": lat, "lon": lon})
+    return flow
+
+
+def test_estimate_skips_zero_scores(guessr):
+    guessr.guesses.add_guess(("p1", 60.18498637, 24.83608603, 29395))
+    guessr.guesses.add_guess(("p1", 60.18466897, 24.83625233, 24566))
+    guessr.guesses.add_guess(("p1", 60.18432798, 24.83515263, 19105))
+    guessr.guesses.add_guess(("p1", 60.3, 24.9, 0))
+    estimate = guessr.guesses.estimate_true_location("p1")
+    assert estimate is not None
+    assert all(map(math.isfinite, estimate))
+
+
+def test_estimate_needs_three_scoring_guesses(guessr):
+    guessr.guesses.add_guess(("p1", 60.18498637, 24.83608603, 29395))
+    guessr.guesses.add_guess(("p1", 60.18466897, 24.83625233, 24566))
+    guessr.guesses.add_guess(("p1", 60.3, 24.9, 0))
+    assert guessr.guesses.estimate_true_location("p1") is None
+
+
+def test_request_keeps_answer_without_finite_estimate(guessr, monkeypatch):
+    monkeypatch.setattr(
+        guessr.guesses, "estimate_true_location", lambda pic: (math.nan, math.nan)
+    )
+    guessr.current_pic = "p1"
+    flow = answer_flow(60.1, 24.1)
+    content = flow.request.content
+    guessr.request(flow)
+    assert flow.request.content == content
+
+
+def test_request_replaces_answer_with_estimate(guessr, monkeypatch):
+    monkeypatch.setattr(
+        guessr.guesses, "estimate_true_location", lambda pic: (60.2, 24.2)
+    )
+    guessr.current_pic = "p1"
+    flow = answer_flow(60.1, 24.1)
+    guessr.request(flow)
+    assert orjson.loads(flow.request.content) == {"lat": 60.2, "lon": 24.2}
+
+
+def test_request_keeps_non_json_answer(guessr, monkeypatch):
+    monkeypatch.setattr(
+        guessr.guesses, "estimate_true_location", lambda pic: (60.2, 24.2)
+    )
+    guessr.current_pic = "p1"
+    flow = answer_flow(60.1, 24.1)
+    flow.request.headers["Content-Type"] = "text/plain"
+    content = flow.request.content
+    with pytest.raises(ValueError):
+        guessr.request(flow)
+    assert flow.request.content == content
+
+
+def test_backup_tried_again_after_failure(main, tmp_path, monkeypatch):
+    events_out = main.EventsOut(tmp_path / "events.txt")
+    guesses = main.Guesses(
+        tmp_path / "guesses.arrow", tmp_path / "backups", events_out=events_out
+    )
+    guesses.backup_interval = 0
+    save_to_file = guesses.save_to_file
+    backup_paths = []
+
+    def fail_once(path, rows=None):
+        backup_paths.append(path)
+        if len(backup_paths) == 1:
+            raise OSError("disk full")
+        save_to_file(path, rows)
+
+    monkeypatch.setattr(guesses, "save_to_file", fail_once)
+    for i in range(2 * guesses.save_every):
+        guesses.add_guess((f"p{i}", 60.0, 24.0, 100.0))
+    guesses.close()
+    events_out.flush()
+    assert len(backup_paths) == 2
+    assert [path.name for path in (tmp_path / "backups").iterdir()] == [
+        os.path.basename(backup_paths[1])
+    ]
+    assert (
+        "Backup failed: OSError('disk full')" in (tmp_path / "events.txt").read_text()
+    )
+    assert len(main.read_guesses(tmp_path / "guesses.arrow")) == 2 * guesses.save_every
+
+
+def make_rows(count: int, pic: str = "p1") -> list[tuple]:
+    return [(pic, 60.0 + i / 1000, 24.0, 100.0 + i) for i in range(count)]
+
+
+@pytest.fixture
+def new_guesses(main, tmp_path):
+    """Makes Guesses on files in tmp_path, closed after the test"""
+    made = []
+
+    def new_guesses(**kwargs):
+        guesses = main.Guesses(
+            tmp_path / "guesses.arrow", tmp_path / "backups", **kwargs
+        )
+        made.append(guesses)
+        return guesses
+
+    yield new_guesses
+    for guesses in made:
+        guesses.close()
+
+
+def test_read_stream_cut_mid_batch(main, tmp_path):
+    path = tmp_path / "guesses.arrow"
+    with pa.ipc.new_stream(path, main.GUESSES_SCHEMA) as writer:
+        writer.write_batch(main.guesses_to_batch(make_rows(3)))
+        writer.write_batch(main.guesses_to_batch(make_rows(2, "p2")))
+    content = path.read_bytes()
+    path.write_bytes(content[: len(content) - 20])
+    assert main.read_guesses(path) == make_rows(3)
+
+
+def test_read_ipc_file_without_footer(main, tmp_path):
+    path = tmp_path / "guesses.arrow"
+    sink = pa.OSFile(str(path), "wb")
+    writer = pa.ipc.new_file(sink, main.GUESSES_SCHEMA)
+    writer.write_batch(main.guesses_to_batch(make_rows(3)))
+    # Left unclosed, as by a crash
+    sink.flush()
+    assert main.read_guesses(path) == make_rows(3)
+
+
+def test_recover_copy_left_by_crash(main, tmp_path, new_guesses):
+    guesses = new_guesses()
+    for row in make_rows(guesses.save_every + 2):
+        guesses.add_guess(row)
+    # What a crash leaves behind: the copy, without a close
+    crashed_dir = tmp_path / "crashed"
+    (crashed_dir / "backups").mkdir(parents=True)
+    shutil.copy(tmp_path / "guesses.arrow.partial", crashed_dir)
+    recovered = main.Guesses(crashed_dir / "guesses.arrow", crashed_dir / "backups")
+    try:
+        # Guesses since the last flush are lost
+        assert recovered.get_guesses("p1") == make_rows(guesses.save_every)
+    finally:
+        recovered.close()
+    assert main.read_guesses(crashed_dir / "guesses.arrow") == make_rows(
+        guesses.save_every
+    )
+
+
+def test_import_replaces_stored_guesses(main, tmp_path, new_guesses):
+    guesses = new_guesses()
+    for row in make_rows(3, "old"):
+        guesses.add_guess(row)
+    guesses.close()
+    import_path = tmp_path / "guesses.parquet"
+    imported_rows = make_rows(2, "new")
+    pq.write_table(
+        pa.Table.from_batches([main.guesses_to_batch(imported_rows)]), import_path
+    )
+    guesses = new_guesses(import_filepath=import_path)
+    assert guesses.total_guesses() == len(imported_rows)
+    assert guesses.get_guesses("new") == imported_rows
+    assert not import_path.exists()
+    assert (tmp_path / "guesses.parquet.imported").exists()
+    guesses.close()
+    # Applied only once
+    assert new_guesses(import_filepath=import_path).get_guesses("new") == imported_rows
+
+
+def test_import_guesses_file_from_pandas(main, tmp_path, new_guesses):
+    # The guesses file used to be written by pandas, index included
+    rows = [
+        ("p1", 60.1, 24.1, 20000.0),
+        ("p1", 60.1, 24.1, 20000.0),
+        ("p2", 60.3, 24.3, 30000.0),
+    ]
+    df = pd.DataFrame(rows, columns=["pic", "lat", "lon", "score"], index=[0, 0, 1])
+    import_path = tmp_path / "guesses.parquet"
+    df.to_parquet(import_path)
+    guesses = new_guesses(import_filepath=import_path)
+    # Repeated guesses are kept as they are
+    assert guesses.get_guesses("p1") == rows[:2]
+    assert guesses.total_guesses() == len(rows)
+    assert guesses.has_perfect_guess("p2")
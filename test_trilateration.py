@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+from scipy.optimize import check_grad, minimize
+
+from trilateration import (
+    mse_and_grad,
+    score_to_distance,
+    trilaterate,
+    trilaterate_lstsq,
+)
+
+# Startup Sauna, as in test_distance_calc.py
+points = [
+    ("d6d73e4d84c92f8c5fff4340a5dce12f", 60.18498637, 24.83608603, 29395),
+    ("d6d73e4d84c92f8c5fff4340a5dce12f", 60.18466897, 24.83625233, 24566),
+    ("d6d73e4d84c92f8c5fff4340a5dce12f", 60.18432798, 24.83515263, 19105),
+    ("d6d73e4d84c92f8c5fff4340a5dce12f", 60.18508505, 24.83578026, 27669),
+]
+
+
+def trilaterate_geodesic(guesses: list) -> tuple[float, float]:
+    """Reference: the geodesic objective trilaterate used to minimize"""
+    locations = [(guess[1], guess[2]) for guess in guesses]
+    distances = [score_to_distance(guess[3]) for guess in guesses]
+
+    def mse(x):
+        errors = [
+            geodesic(x, location).meters - distance
+            for location, distance in zip(locations, distances)
+        ]
+        return np.mean(np.square(errors))
+
+    initial_location = min(zip(distances, locations))[1]
+    result = minimize(mse, initial_location, method="L-BFGS-B", options={"ftol": 1e-12})
+    return tuple(result.x)
+
+
+@pytest.mark.parametrize("guesses", [points, points[1:]], ids=["all", "last three"])
+def test_trilaterate_matches_geodesic(guesses):
+    estimate = trilaterate(guesses)
+    reference = trilaterate_geodesic(guesses)
+    assert geodesic(estimate, reference).meters < 0.05
+
+
+def test_trilaterate_returns_floats():
+    # Estimates are serialized into the answer body with orjson
+    assert all(type(coordinate) is float for coordinate in trilaterate(points))
+
+
+@pytest.mark.parametrize(
+    "x",
+    [(60.1848, 24.8358), (60.1846, 24.8362), (60.17, 24.85), (60.19, 24.80)],
+)
+def test_mse_gradient(x):
+    locations_rad = np.radians([(guess[1], guess[2]) for guess in points])
+    distances = np.array([3.0, 40.0, 90.0, 20.0])
+    args = (locations_rad, distances)
+    x = np.array(x)
+    grad = mse_and_grad(x, *args)[1]
+    # Degrees are large steps in meters, so a small step keeps the
+    # forward difference accurate
+    error = check_grad(
+        lambda x: mse_and_grad(x, *args)[0],
+        lambda x: mse_and_grad(x, *args)[1],
+        x,
+        epsilon=1e-9,
+    )
+    assert error < 1e-4 * np.linalg.norm(grad)
+
+
+def test_lstsq_solves_exact_distances():
+    truth = (60.1848, 24.8358)
+    locations = np.array([(guess[1], guess[2]) for guess in points])
+    distances = np.array([geodesic(truth, location).meters for location in locations])
+    estimate = trilaterate_lstsq(locations, distances)
+    assert geodesic(estimate, truth).meters < 0.5
+
+
+def test_lstsq_collinear_is_none():
+    locations = np.array([(60.18, 24.83), (60.181, 24.831), (60.182, 24.832)])
+    distances = np.array([50.0, 60.0, 70.0])
+    assert trilaterate_lstsq(locations, distances) is None
+
+
+@pytest.mark.parametrize("score", [0, -1, 30001, np.array([100.0, 0.0])])
+def test_score_to_distance_out_of_range(score):
+    with pytest.raises(ValueError):
+        score_to_distance(score)
@@ -1,19 +1,24 @@
-from math import pow, log, exp
-from collections.abc import Iterable, Sequence
+from math import exp
 
-from geopy.distance import distance as distance_func
+import numpy as np
 from scipy.optimize import minimize
 
+# WGS-84 ellipsoid, semi-major axis in meters and first eccentricity squared
+WGS84_A = 6378137.0
+WGS84_E2 = 6.69437999014e-3
 
-def score_to_distance(score: int | float) -> float:
+
+def score_to_distance(score: int | float | np.ndarray) -> float | np.ndarray:
     """Distance from the real answer.
     Derived by finding best fit using different models.
+    Works elementwise on arrays of scores.
+    A score of 0 has no finite distance, so it is rejected.
     """
-    if score < 0 or score > 30000:
-        raise ValueError("score has to be between 0 and 30000")
+    if np.any(np.less_equal(score, 0)) or np.any(np.greater(score, 30000)):
+        raise ValueError("score has to be over 0 and at most 30000")
     a = 30000
     b = -0.005
-    return log(score / a) / b
+    return np.log(np.divide(score, a)) / b
 
 
 def distance_to_score(distance: int | float):
@@ -27,38 +32,100 @@ def distance_to_score(distance: int | float):
     return a * exp(b * distance)
 
 
-def mse(
-    x: tuple[float, float],
-    locations: Iterable[tuple[float, float]],
-    distances: Sequence[float],
-) -> float:
-    """Mean squared error for optimization"""
-    mse = 0.0
-    for location, distance in zip(locations, distances):
-        distance_calculated = distance_func(x, location).meters
-        mse += pow(distance_calculated - distance, 2.0)
-    return mse / len(distances)
+def mse_and_grad(
+    x: np.ndarray,
+    locations_rad: np.ndarray,
+    distances: np.ndarray,
+) -> tuple[float, np.ndarray]:
+    """Mean squared error for optimization, and its gradient.
+    Takes x as (lat, lon) in degrees and locations as an (n, 2) array
+    of (lat, lon) in radians.
+    Distances use the WGS-84 radii of curvature at the midpoint latitude,
+    which agrees with the geodesic distance to millimeters over a few
+    kilometers. The radii are treated as constant when differentiating.
+    """
+    lat, lon = np.radians(x)
+    lats_rad = locations_rad[:, 0]
+    d_lon = locations_rad[:, 1] - lon
+    mid_lat = (lats_rad + lat) / 2
+    sin_mid_lat = np.sin(mid_lat)
+    cos_mid_lat = np.cos(mid_lat)
+    w2 = 1 - WGS84_E2 * sin_mid_lat**2
+    meridional_radius = WGS84_A * (1 - WGS84_E2) / (w2 * np.sqrt(w2))
+    normal_radius = WGS84_A / np.sqrt(w2)
+    north = meridional_radius * (lats_rad - lat)
+    east = normal_radius * cos_mid_lat * d_lon
+    distances_calculated = np.hypot(north, east)
+    errors = distances_calculated - distances
+    mse = np.mean(errors**2)
+    # d(mse)/d(distance) per location, divided by the distance for the
+    # north and east components below; zero where x sits on a location
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(
+            distances_calculated > 0, 2 * errors / distances_calculated, 0.0
+        )
+    weights /= len(distances)
+    d_east_d_lat = -normal_radius * sin_mid_lat * d_lon / 2
+    grad_lat = np.sum(weights * (-north * meridional_radius + east * d_east_d_lat))
+    grad_lon = np.sum(weights * (-east * normal_radius * cos_mid_lat))
+    grad = np.radians(np.array([grad_lat, grad_lon]))
+    return float(mse), grad
+
+
+def trilaterate_lstsq(
+    locations: np.ndarray, distances: np.ndarray
+) -> np.ndarray | None:
+    """Closed-form estimate (lat, lon) from the linearized trilateration
+    system, solved by least squares on a tangent plane at the centroid.
+    Returns None if the locations don't span the plane, e.g. are collinear.
+    """
+    lat0, lon0 = np.radians(locations.mean(axis=0))
+    w2 = 1 - WGS84_E2 * np.sin(lat0) ** 2
+    meridional_radius = WGS84_A * (1 - WGS84_E2) / (w2 * np.sqrt(w2))
+    normal_radius = WGS84_A / np.sqrt(w2)
+    lats_rad, lons_rad = np.radians(locations).T
+    east = normal_radius * np.cos(lat0) * (lons_rad - lon0)
+    north = meridional_radius * (lats_rad - lat0)
+    # Subtract the last circle's equation from the others to cancel
+    # the quadratic terms
+    a = 2 * np.column_stack((east[:-1] - east[-1], north[:-1] - north[-1]))
+    b = (
+        east[:-1] ** 2
+        - east[-1] ** 2
+        + north[:-1] ** 2
+        - north[-1] ** 2
+        - distances[:-1] ** 2
+        + distances[-1] ** 2
+    )
+    # Treat nearly collinear locations as collinear
+    (x, y), _, rank, _ = np.linalg.lstsq(a, b, rcond=1e-6)
+    if rank < 2:
+        return None
+    lat = lat0 + y / meridional_radius
+    lon = lon0 + x / (normal_radius * np.cos(lat0))
+    return np.degrees(np.array([lat, lon]))
 
 
 def trilaterate(guesses: list | tuple) -> tuple[float, float]:
     """Find the real location by trilateration.
     Takes guesses of form (pic, lat, lon, score).
     """
-    locations = []
-    distances = []
-    for guess in guesses:
-        coords = (guess[1], guess[2])
-        score = guess[3]
-        locations.append(coords)
-        d = score_to_distance(score)
-        distances.append(d)
-    initial_location = min(zip(distances, locations), key=lambda x: x[0])[1]
+    # One (lat, lon, score) array, converted to distances in a single call
+    columns = np.array([guess[1:4] for guess in guesses], dtype=float)
+    locations = columns[:, :2]
+    distances = score_to_distance(columns[:, 2])
+    # Start from the linear solution, or the guess thought closest when
+    # there is none
+    initial_location = trilaterate_lstsq(locations, distances)
+    if initial_location is None:
+        initial_location = locations[np.argmin(distances)]
     result = minimize(
-        mse,
+        mse_and_grad,
         initial_location,
-        args=(locations, distances),
+        args=(np.radians(locations), distances),
+        jac=True,
         method="L-BFGS-B",
         options={"ftol": 1e-5, "maxiter": 1e7},
     )
-    estimated_location = tuple(result.x)
+    estimated_location = tuple(result.x.tolist())
     return estimated_location